@@ -8,10 +8,11 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
-import six
 import abc
+import sys
 import datetime
-from collections import OrderedDict, MutableMapping
+from collections import deque
+from collections.abc import MutableMapping
 
 import odml2
 
@@ -23,9 +24,12 @@ Provides abstract base classes for back-end implementations.
 #         properties in order to distinguish more precisely between read-only
 #         and read-write attributes.
 
+# property kinds used in the unified per section property store
+KIND_VALUE = 0
+KIND_SECTION = 1
 
-@six.add_metaclass(abc.ABCMeta)
-class BaseDocument(object):
+
+class BaseDocument(abc.ABC):
     """
     Low level access to data of an odML2 document.
     """
@@ -185,8 +189,8 @@ class BaseDocument(object):
         pass
 
     def to_dict(self):
-        root = OrderedDict(author=self.get_author(), date=self.get_date(),
-                           document_version=self.get_version(), format_version=2)
+        root = dict(author=self.get_author(), date=self.get_date(),
+                    document_version=self.get_version(), format_version=2)
 
         def convert_value(val):
             if val.unit is not None or val.uncertainty is not None:
@@ -195,55 +199,76 @@ class BaseDocument(object):
                 return val.value
 
         def convert_ns():
-            ns_dict = OrderedDict()
+            ns_dict = {}
             for ns in self.namespaces.values():
                 ns_dict[ns.prefix] = ns.uri
             return ns_dict if len(ns_dict) > 0 else None
 
         def convert_definitions():
-            defs_dict = OrderedDict()
+            defs_dict = {}
             for pd in self.property_defs.values():
-                pd_dict = OrderedDict(types=pd.types)
+                pd_dict = dict(types=pd.types)
                 definition = pd.definition
                 if definition is not None:
                     pd_dict["definition"] = definition
                 defs_dict[pd.name] = pd_dict
             for td in self.type_defs.values():
-                td_dict = OrderedDict(properties=td.properties)
+                td_dict = dict(properties=td.properties)
                 definition = td.definition
                 if definition is not None:
                     td_dict["definition"] = definition
                 defs_dict[td.name] = td_dict
             return defs_dict if len(defs_dict) > 0 else None
 
-        def convert_ref(ref):
-            if ref.is_link:
-                link = ref.uuid
-                if ref.namespace is not None:
-                    link = ref.namespace + ":" + link
-                return link
-            else:
-                return convert_section(ref.uuid)
-
-        def convert_section(uuid):
-            sec = self.sections[uuid]
-            sec_dict = OrderedDict(uuid=uuid, type=sec.get_type())
-            label = sec.get_label()
-            if label is not None:
-                sec_dict["label"] = label
-            reference = sec.get_reference()
-            if reference is not None:
-                sec_dict["reference"] = reference
-            for prop in sec.value_properties:
-                value = sec.value_properties[prop]
-                sec_dict[prop] = convert_value(value)
-            for prop in sec.section_properties:
-                refs = sec.section_properties[prop]
-                if len(refs) == 1:
-                    sec_dict[prop] = convert_ref(refs[0])
-                else:
-                    sec_dict[prop] = [convert_ref(ref) for ref in refs]
-            return sec_dict
+        def convert_link(ref):
+            link = ref.uuid
+            if ref.namespace is not None:
+                link = ref.namespace + ":" + link
+            return link
+
+        def convert_section(root_uuid):
+            # walk the section tree with an explicit stack instead of
+            # recursing, sub section dicts are placed into their parent
+            # container once popped
+            holder = [None]
+            stack = [(root_uuid, holder, 0)]
+            while stack:
+                uuid, container, key = stack.pop()
+                sec = self.sections[uuid]
+                sec_dict = dict(uuid=uuid, type=sec.get_type())
+                label = sec.get_label()
+                if label is not None:
+                    sec_dict["label"] = label
+                reference = sec.get_reference()
+                if reference is not None:
+                    sec_dict["reference"] = reference
+                # one pass over the unified store instead of a filtered scan
+                # plus a keyed lookup per property and kind; value properties
+                # are emitted first, as before
+                section_props = []
+                for prop, (kind, data) in sec.properties.items():
+                    if kind == KIND_VALUE:
+                        sec_dict[prop] = convert_value(data)
+                    else:
+                        section_props.append((prop, data))
+                for prop, refs in section_props:
+                    if len(refs) == 1:
+                        ref = refs[0]
+                        if ref.is_link:
+                            sec_dict[prop] = convert_link(ref)
+                        else:
+                            sec_dict[prop] = None
+                            stack.append((ref.uuid, sec_dict, prop))
+                    else:
+                        targets = [None] * len(refs)
+                        for i, ref in enumerate(refs):
+                            if ref.is_link:
+                                targets[i] = convert_link(ref)
+                            else:
+                                stack.append((ref.uuid, targets, i))
+                        sec_dict[prop] = targets
+                container[key] = sec_dict
+            return holder[0]
 
         root["namespaces"] = convert_ns()
         root["definitions"] = convert_definitions()
@@ -276,25 +301,38 @@ class BaseDocument(object):
                 elif "properties" in def_data:
                     self.type_defs.set(name, def_data.get("definition"), def_data["properties"])
 
-        def read_section(parent_uuid, parent_prop, sec_data):
-            if parent_uuid is None:
-                self.create_root(sec_data["type"], sec_data["uuid"], sec_data.get("label"), sec_data.get("reference"))
-            else:
-                self.sections.add(sec_data["type"], sec_data["uuid"], sec_data.get("label"), sec_data.get("reference"),
-                                  parent_uuid, parent_prop)
-            properties = ((k, v) for k, v in sec_data.items() if k not in ("type", "uuid", "label", "reference"))
-            for prop, element in properties:
-                if isinstance(element, dict):
-                    read_section(sec_data["uuid"], prop, element)
-                elif isinstance(element, list):
-                    for sub_elem in element:
-                        read_section(sec_data["uuid"], prop, sub_elem)
-                else:
-                    section = self.sections[sec_data["uuid"]]
-                    section.value_properties.set(prop, odml2.Value.from_obj(element))
-
         if "metadata" in data and data["metadata"] is not None:
-            read_section(None, None, data["metadata"])
+            # collect all section records in one breadth first walk and hand
+            # them to the back end as a batch, values are set afterwards once
+            # their sections exist
+            records = []
+            value_props = []
+            worklist = deque(((None, None, data["metadata"]), ))
+            while worklist:
+                parent_uuid, parent_prop, sec_data = worklist.popleft()
+                # the same type and property names occur in many sections,
+                # interning them lets later dict lookups take the string
+                # identity fast path
+                uuid = sec_data["uuid"]
+                records.append((sys.intern(sec_data["type"]), uuid, sec_data.get("label"),
+                                sec_data.get("reference"), parent_uuid, parent_prop))
+                for k, element in sec_data.items():
+                    if k in ("type", "uuid", "label", "reference"):
+                        continue
+                    prop = sys.intern(k)
+                    if isinstance(element, dict):
+                        worklist.append((uuid, prop, element))
+                    elif isinstance(element, list):
+                        for sub_elem in element:
+                            worklist.append((uuid, prop, sub_elem))
+                    else:
+                        value_props.append((uuid, prop, element))
+
+            sections = self.sections
+            sections.add_many(records)
+            value_from_obj = odml2.Value.from_obj
+            for uuid, prop, element in value_props:
+                sections[uuid].value_properties.set(prop, value_from_obj(element))
 
 
 class BaseNameSpaceMap(MutableMapping):
@@ -338,17 +376,32 @@ class BaseSectionMap(MutableMapping):
     def add(self, type, uuid, label, reference, parent_uuid, parent_prop):
         pass
 
+    def add_many(self, records):
+        """
+        Add a batch of sections at once. Back-ends may override this with a
+        more efficient bulk implementation.
+
+        :param records: Tuples of (type, uuid, label, reference, parent_uuid, parent_prop)
+                        ordered so that parents always precede their children.
+        :type records: list[tuple]
+        """
+        add = self.add
+        for record in records:
+            add(*record)
+
     @abc.abstractmethod
     def add_link(self, uuid, prefix, parent_uuid, parent_prop):
         pass
 
 
-@six.add_metaclass(abc.ABCMeta)
-class BaseSection(object):
+class BaseSection(abc.ABC):
     """
     Low level access to a section within a document.
     """
 
+    # empty slots so that slotted subclasses don't inherit a __dict__
+    __slots__ = ()
+
     @abc.abstractmethod
     def is_linked(self):
         pass
@@ -382,6 +435,17 @@ class BaseSection(object):
     def set_reference(self, reference):
         pass
 
+    @property
+    def properties(self):
+        """
+        Unified read access to all properties of the section, mapping each
+        property name to a (kind, data) tuple where kind is KIND_VALUE or
+        KIND_SECTION.
+
+        :rtype: collections.Mapping
+        """
+        raise NotImplementedError()
+
     @property
     def section_properties(self):
         """
@@ -402,6 +466,8 @@ class BaseSectionPropertyMap(MutableMapping):
     Dict like accessor for section properties.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def set(self, prop, refs):
         """
@@ -442,6 +508,8 @@ class BaseValuePropertyMap(MutableMapping):
     Dict like accessor for section properties.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def set(self, prop, value):
         """
@@ -9,6 +9,7 @@
 # LICENSE file in the root of the project.
 
 import abc
+import sys
 from uuid import UUID
 from sortedcontainers import SortedDict
 import odml2
@@ -301,16 +302,26 @@ class MemSectionMap(base.BaseSectionMap):
 
 class MemSection(base.BaseSection):
 
+    # documents hold one record plus two property views per section, fixed
+    # slots keep that per section cost at three compact objects
+    __slots__ = ("_MemSection__doc", "_MemSection__type", "_MemSection__uuid", "_MemSection__label",
+                 "_MemSection__reference", "_MemSection__is_linked", "_MemSection__props",
+                 "_MemSection__counts", "_MemSection__sections_properties", "_MemSection__value_properties")
+
     # noinspection PyShadowingBuiltins
     def __init__(self, doc, type, uuid, label, reference, is_linked):
         self.__doc = doc
-        self.__type = type
+        # type names repeat across many sections, interned copies share one
+        # str object and make dict lookups take the identity fast path
+        self.__type = sys.intern(type)
         self.__uuid = uuid
         self.__label = label
         self.__reference = reference
         self.__is_linked = is_linked
-        self.__sections_properties = MemSectionPropertyMap(doc)
-        self.__value_properties = MemValuePropertyMap(doc)
+        self.__props = SortedDict()
+        self.__counts = [0, 0]
+        self.__sections_properties = MemSectionPropertyMap(doc, self.__props, self.__counts)
+        self.__value_properties = MemValuePropertyMap(doc, self.__props, self.__counts)
 
     def is_linked(self):
         return self.__is_linked
@@ -324,7 +335,7 @@ class MemSection(base.BaseSection):
     # noinspection PyShadowingBuiltins
     def set_type(self, type, check=False):
         self.__doc.assert_writable()
-        self.__type = type
+        self.__type = sys.intern(type)
 
     def get_label(self):
         return self.__label
@@ -340,6 +351,10 @@ class MemSection(base.BaseSection):
         self.__doc.assert_writable()
         self.__reference = reference
 
+    @property
+    def properties(self):
+        return self.__props
+
     @property
     def section_properties(self):
         return self.__sections_properties
@@ -350,58 +365,94 @@ class MemSection(base.BaseSection):
 
 
 class MemSectionPropertyMap(base.BaseSectionPropertyMap):
+    """
+    View on the section kind entries of the unified property store of a section.
+    """
 
-    def __init__(self, doc):
+    __slots__ = ("_MemSectionPropertyMap__doc", "_MemSectionPropertyMap__props",
+                 "_MemSectionPropertyMap__counts")
+
+    def __init__(self, doc, props, counts):
         self.__doc = doc
-        self.__section_props = SortedDict()
+        self.__props = props
+        self.__counts = counts
 
     def set(self, prop, refs):
         self.__doc.assert_writable()
-        self.__section_props[prop] = refs
+        prop = sys.intern(prop)
+        old = self.__props.get(prop)
+        if old is not None:
+            self.__counts[old[0]] -= 1
+        self.__props[prop] = (base.KIND_SECTION, refs)
+        self.__counts[base.KIND_SECTION] += 1
 
     def __setitem__(self, prop, refs):
-        self.__doc.assert_writable()
-        self.__section_props[prop] = refs
+        self.set(prop, refs)
 
     def __getitem__(self, prop):
-        return self.__section_props[prop]
+        kind, refs = self.__props[prop]
+        if kind != base.KIND_SECTION:
+            raise KeyError(prop)
+        return refs
 
     def __delitem__(self, prop):
         self.__doc.assert_writable()
-        del self.__section_props[prop]
+        kind, _ = self.__props[prop]
+        if kind != base.KIND_SECTION:
+            raise KeyError(prop)
+        del self.__props[prop]
+        self.__counts[base.KIND_SECTION] -= 1
 
     def __len__(self):
-        return len(self.__section_props)
+        return self.__counts[base.KIND_SECTION]
 
     def __iter__(self):
-        return iter(self.__section_props)
+        return (p for p, entry in self.__props.items() if entry[0] == base.KIND_SECTION)
 
 
 class MemValuePropertyMap(base.BaseValuePropertyMap):
+    """
+    View on the value kind entries of the unified property store of a section.
+    """
 
-    def __init__(self, doc):
+    __slots__ = ("_MemValuePropertyMap__doc", "_MemValuePropertyMap__props",
+                 "_MemValuePropertyMap__counts")
+
+    def __init__(self, doc, props, counts):
         self.__doc = doc
-        self.__value_props = SortedDict()
+        self.__props = props
+        self.__counts = counts
 
     def set(self, prop, value):
         self.__doc.assert_writable()
         if not isinstance(value, odml2.Value):
             raise ValueError("Type odml2.Value expected, but was %s" % type(value))
-        self.__value_props[prop] = value
+        prop = sys.intern(prop)
+        old = self.__props.get(prop)
+        if old is not None:
+            self.__counts[old[0]] -= 1
+        self.__props[prop] = (base.KIND_VALUE, value)
+        self.__counts[base.KIND_VALUE] += 1
 
     def __setitem__(self, prop, value):
-        self.__doc.assert_writable()
         self.set(prop, value)
 
-    def __getitem__(self, key):
-        return self.__value_props[key]
+    def __getitem__(self, prop):
+        kind, value = self.__props[prop]
+        if kind != base.KIND_VALUE:
+            raise KeyError(prop)
+        return value
 
     def __delitem__(self, prop):
         self.__doc.assert_writable()
-        del self.__value_props[prop]
+        kind, _ = self.__props[prop]
+        if kind != base.KIND_VALUE:
+            raise KeyError(prop)
+        del self.__props[prop]
+        self.__counts[base.KIND_VALUE] -= 1
 
     def __len__(self):
-        return len(self.__value_props)
+        return self.__counts[base.KIND_VALUE]
 
     def __iter__(self):
-        return iter(self.__value_props)
+        return (p for p, entry in self.__props.items() if entry[0] == base.KIND_VALUE)
@@ -12,12 +12,29 @@
 Provides a back-and implementation for yaml using the memory back-end base classes.
 """
 
-import six
+import os
+import io as _io
+import copy
 import yaml
+import hashlib
+import datetime as dt
 from collections import OrderedDict
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 from odml2.api import mem
 
+# use the libyaml based loader/dumper if PyYAML was built with it
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# cache of parsed documents keyed on a hash of the raw document content
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_MAX_SIZE = 128
+
 
 class YamlDocument(mem.MemDocument):
 
@@ -31,43 +48,184 @@ class YamlDocument(mem.MemDocument):
     def load(self, io, uri=None):
         writable = self.is_writable()
         try:
-            data = yaml.load(io)
+            buf = io.read()
+            raw = buf.encode("utf-8") if not isinstance(buf, bytes) else buf
+            key = hashlib.blake2b(raw, digest_size=16).digest()
+            sidecar = uri + ".cache" if msgpack is not None and uri and os.path.isfile(uri) else None
+            if key in _PARSE_CACHE:
+                _PARSE_CACHE.move_to_end(key)
+                # hand out a copy so that the cached data can't be mutated
+                data = copy.deepcopy(_PARSE_CACHE[key])
+            else:
+                data = _sidecar_read(sidecar, key) if sidecar is not None else None
+                if data is None:
+                    data = yaml.load(buf, Loader=Loader)
+                    if sidecar is not None:
+                        _sidecar_write(sidecar, key, data)
+                _PARSE_CACHE[key] = data
+                if len(_PARSE_CACHE) > _PARSE_CACHE_MAX_SIZE:
+                    _PARSE_CACHE.popitem(last=False)
             self._set_writable(True)
             self.from_dict(data)
             self.set_uri(uri)
         finally:
             self._set_writable(writable)
 
+    @staticmethod
+    def clear_parse_cache():
+        """
+        Invalidate all cached parse results.
+        """
+        _PARSE_CACHE.clear()
+
+    def snapshot(self, path):
+        """
+        Write a binary checkpoint of the document to a file. Snapshots are
+        meant for internal use (checkpoints, crash recovery) where YAML
+        fidelity is not needed; packing and unpacking them is roughly an
+        order of magnitude faster than a YAML round trip.
+
+        :param path: The file the snapshot is written to.
+        """
+        if msgpack is None:
+            raise RuntimeError("The msgpack package is required for document snapshots")
+        with open(path, "wb") as f:
+            f.write(msgpack.packb(self.to_dict(), default=_pack_default))
+
+    def restore(self, path):
+        """
+        Fill the document with data from a snapshot file written by
+        :meth:`~.YamlDocument.snapshot`. The uri of the document is left
+        unchanged.
+
+        :param path: The file the snapshot is read from.
+        """
+        if msgpack is None:
+            raise RuntimeError("The msgpack package is required for document snapshots")
+        with open(path, "rb") as f:
+            data = msgpack.unpackb(f.read(), raw=False, strict_map_key=False, object_hook=_unpack_hook)
+        writable = self.is_writable()
+        try:
+            self._set_writable(True)
+            self.from_dict(data)
+        finally:
+            self._set_writable(writable)
+
     def save(self, io, uri=None):
         writable = self.is_writable()
         try:
             self._set_writable(True)
+            # to_dict pre-converts the document into plain dicts, lists and
+            # scalars, so every node hits the dumper's exact-type representer
+            # table and never falls back to the MRO scanning multi dispatch
             data = self.to_dict()
-            yaml_str = yaml.dump(data, default_flow_style=False, allow_unicode=True)
-            if six.PY2:
-                yaml_str = yaml_str.decode("utf-8")
-            io.write(yaml_str)
+            # emit straight into the target stream instead of buffering the
+            # whole document as a single string first; when a sidecar can be
+            # written the stream is teed through a content hash so the next
+            # load finds a fresh cache without parsing the YAML again
+            # binary streams get UTF-8 bytes straight from the emitter, text
+            # streams get str
+            encoding = None if _is_text_stream(io) else "utf-8"
+            if msgpack is not None and uri is not None:
+                out = _HashingWriter(io)
+                yaml.dump(data, out, default_flow_style=False, allow_unicode=True, sort_keys=False,
+                          encoding=encoding, Dumper=Dumper)
+                _sidecar_write(uri + ".cache", out.digest(), data)
+            else:
+                yaml.dump(data, io, default_flow_style=False, allow_unicode=True, sort_keys=False,
+                          encoding=encoding, Dumper=Dumper)
             self.set_uri(uri)
         finally:
             self._set_writable(writable)
 
 
-def __ordered_dict_representer(dumper, od):
-    nodes = [(dumper.represent_data(k), dumper.represent_data(v)) for k, v in od.items()]
-    return yaml.nodes.MappingNode(u'tag:yaml.org,2002:map', nodes)
+#
+# optional msgpack sidecar, an <uri>.cache file holding the content hash of
+# the source document followed by the packed parse result; unpacking it is
+# roughly an order of magnitude faster than parsing the YAML again
+#
 
-yaml.add_representer(OrderedDict, __ordered_dict_representer)
+def _is_text_stream(stream):
+    return isinstance(stream, _io.TextIOBase)
+
+
+class _HashingWriter(object):
+    """
+    Forwards written data to a stream while hashing its UTF-8 encoding,
+    producing the same key that load() computes from the file content.
+    """
+
+    def __init__(self, stream):
+        self.__stream = stream
+        self.__hash = hashlib.blake2b(digest_size=16)
+
+    def write(self, data):
+        self.__hash.update(data if isinstance(data, bytes) else data.encode("utf-8"))
+        self.__stream.write(data)
+
+    def digest(self):
+        return self.__hash.digest()
+
+
+def _pack_default(obj):
+    if isinstance(obj, frozenset):
+        # matches the YAML round trip, which reads sequences back as lists
+        return list(obj)
+    if isinstance(obj, dt.datetime):
+        return {"__datetime__": obj.isoformat()}
+    elif isinstance(obj, dt.date):
+        return {"__date__": obj.isoformat()}
+    elif isinstance(obj, dt.time):
+        return {"__time__": obj.isoformat()}
+    raise TypeError("Can't pack object of type %s" % type(obj))
+
+
+def _unpack_hook(obj):
+    if "__datetime__" in obj:
+        return dt.datetime.fromisoformat(obj["__datetime__"])
+    elif "__date__" in obj:
+        return dt.date.fromisoformat(obj["__date__"])
+    elif "__time__" in obj:
+        return dt.time.fromisoformat(obj["__time__"])
+    return obj
+
+
+def _sidecar_read(path, key):
+    # the sidecar is best effort, a stale or unreadable one means a normal parse
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    if len(raw) <= 16 or raw[:16] != key:
+        return None
+    try:
+        return msgpack.unpackb(raw[16:], raw=False, strict_map_key=False, object_hook=_unpack_hook)
+    except Exception:
+        return None
+
+
+def _sidecar_write(path, key, data):
+    try:
+        payload = msgpack.packb(data, default=_pack_default)
+    except TypeError:
+        return
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(key)
+            f.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        pass
 
 
 def __frozenset_representer(dumper, fs):
     nodes = [dumper.represent_data(v) for v in fs]
     return yaml.nodes.SequenceNode(u'tag:yaml.org,2002:seq', nodes)
 
-yaml.add_representer(frozenset, __frozenset_representer)
-
-if six.PY2:
-    def __unicode_str_representer(_, ustr):
-        return yaml.nodes.ScalarNode(u'tag:yaml.org,2002:str', ustr)
-
-    # noinspection PyUnresolvedReferences
-    yaml.add_representer(unicode, __unicode_str_representer)
+# register on the pure Python dumper as well, both classes keep separate
+# representer tables and the C variant is only one possible choice above
+yaml.SafeDumper.add_representer(frozenset, __frozenset_representer)
+if Dumper is not yaml.SafeDumper:
+    Dumper.add_representer(frozenset, __frozenset_representer)
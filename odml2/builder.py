@@ -8,8 +8,11 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
+import sys
 from uuid import uuid4
+from collections import deque
 
+import odml2
 from odml2.checks import *
 
 __all__ = ("SB", )
@@ -20,13 +23,24 @@ class SB(object):
     A section builder
     """
 
+    # builders are created in large numbers when documents are assembled,
+    # fixed slots avoid a per instance __dict__ for the named attributes
+    __slots__ = ("type", "uuid", "label", "reference", "properties")
+
     # noinspection PyShadowingBuiltins
     def __init__(self, type, uuid=None, label=None, reference=None, **properties):
-        uuid = str(uuid) if uuid is not None else str(uuid4())
-        assert_uuid(uuid)
+        if uuid is None:
+            # freshly generated ids are valid by construction, only ids
+            # supplied by the caller need the format check
+            uuid = str(uuid4())
+        else:
+            uuid = str(uuid)
+            assert_uuid(uuid)
         for p in properties:
             assert_prefixed_name(p)
-        self.type = type
+        # property names arrive as keyword arguments and are interned by the
+        # interpreter already, the type recurs across builders and is not
+        self.type = sys.intern(type)
         self.uuid = uuid
         self.label = label
         self.reference = reference
@@ -34,13 +48,76 @@ class SB(object):
 
     # noinspection PyProtectedMember
     def build(self, document, parent_uuid=None, parent_prop=None):
+        if parent_uuid is not None and parent_prop is None:
+            raise ValueError("A property name is needed in order to append a sub section")
+
+        strategy = document.terminology_strategy
+        # bind frequently used globals once, the handlers below run per property
+        _section = odml2.Section
+        _value_from_obj = odml2.Value.from_obj
+        records = []
+        value_props = []
+        copies = []
+
+        # walk the builder tree breadth first so that parents always precede
+        # their children in the collected records
         if parent_uuid is None:
-            section = document.create_root(self.type, self.uuid, self.label, self.reference)
+            parent_type = None
         else:
-            if parent_prop is None:
-                raise ValueError("A property name is needed in order to append a sub section")
-            parent = document.find_section(parent_uuid)
-            section = parent._create_subsection(parent_prop, self.type, self.uuid, self.label, self.reference)
+            parent_type = document.back_end.sections[parent_uuid].get_type()
+        # dispatch each property target on its concrete type instead of walking
+        # an isinstance chain per element
+        def handle_builder(thing, parent, prop):
+            worklist.append((thing, parent.uuid, prop, parent.type))
+
+        def handle_copy(thing, parent, prop):
+            copies.append((thing, parent.uuid, prop))
+
+        def handle_seq(thing, parent, prop):
+            for sub in thing:
+                handler = handlers.get(sub.__class__)
+                if handler is None:
+                    if isinstance(sub, SB):
+                        handler = handle_builder
+                    elif isinstance(sub, _section):
+                        handler = handle_copy
+                    else:
+                        raise ValueError("Section builder expected but was %s" % type(sub))
+                elif handler is handle_seq:
+                    raise ValueError("Section builder expected but was %s" % type(sub))
+                handler(sub, parent, prop)
+
+        def handle_value(thing, parent, prop):
+            val = _value_from_obj(thing)
+            strategy.handle_triple(document, parent.type, prop, val.type)
+            value_props.append((parent.uuid, prop, val))
+
+        def handle_other(thing, parent, prop):
+            # subclasses are not in the dispatch table, check them explicitly
+            if isinstance(thing, SB):
+                handle_builder(thing, parent, prop)
+            elif isinstance(thing, _section):
+                handle_copy(thing, parent, prop)
+            else:
+                handle_value(thing, parent, prop)
+
+        handlers = {SB: handle_builder, list: handle_seq, tuple: handle_seq,
+                    _section: handle_copy}
+
+        worklist = deque(((self, parent_uuid, parent_prop, parent_type), ))
+        while worklist:
+            sb, p_uuid, p_prop, p_type = worklist.popleft()
+            if p_uuid is None:
+                strategy.handle_type(document, sb.type)
+            else:
+                strategy.handle_triple(document, p_type, p_prop, sb.type)
+            records.append((sb.type, sb.uuid, sb.label, sb.reference, p_uuid, p_prop))
+            for p, thing in sb.properties.items():
+                handlers.get(thing.__class__, handle_other)(thing, sb, p)
 
-        for p, thing in self.properties.items():
-            section[p] = thing
+        sections = document.back_end.sections
+        sections.add_many(records)
+        for uuid, p, val in value_props:
+            sections[uuid].value_properties.set(p, val)
+        for section, uuid, p in copies:
+            section._copy_section(document, uuid, p)
@@ -8,17 +8,11 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
-import six
-# noinspection PyUnresolvedReferences
-from six.moves import StringIO
-# noinspection PyUnresolvedReferences
-from six.moves.urllib.parse import urlparse
-
 import io
 import os
 import requests
 import datetime as dt
-from future.utils import python_2_unicode_compatible
+from urllib.parse import urlparse
 
 import odml2
 from odml2.checks import split_prefixed_name
@@ -30,7 +24,6 @@ __all__ = ("BACK_ENDS", "Document", "TerminologyMode")
 BACK_ENDS = (yml.YamlDocument, )
 
 
-@python_2_unicode_compatible
 class Document(object):
     """
     :param back_end:    The name of the back-end to use for this document or a back-end instance.
@@ -40,7 +33,7 @@ class Document(object):
     """
 
     def __init__(self, back_end="yaml", strategy=odml2.TerminologyStrategy.Ignore):
-        if isinstance(back_end, six.string_types):
+        if isinstance(back_end, str):
             found = False
             for be in BACK_ENDS:
                 if be.NAME == back_end:
@@ -99,7 +92,7 @@ class Document(object):
 
     @author.setter
     def author(self, author):
-        if not isinstance(author, six.string_types):
+        if not isinstance(author, str):
             raise ValueError("Author must be a string")
         self.back_end.set_author(author)
 
@@ -331,7 +324,7 @@ class Document(object):
                 result = requests.get(source)
                 mime_type = result.headers["content-type"].split(";")[0]
                 back_end = self.__find_back_end(mime_type)(is_writable)
-                back_end.load(StringIO(result.text), source)
+                back_end.load(io.StringIO(result.text), source)
                 self.__set_back_end(back_end)
             else:
                 raise RuntimeError("Unable to load from source: %s" % source)
@@ -1,4 +1,5 @@
 # coding=UTF-8
+# cython: language_level=3
 
 # Copyright (c) 2015, Adrian Stoewer (adrian.stoewer@rz.ifi.lmu.de)
 #
@@ -8,40 +9,69 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
-import six
-from future.utils import python_2_unicode_compatible
-
 import re
 import numbers
 import itertools
-import collections
+import collections.abc
 import datetime as dt
+from collections import deque
 
 import odml2
+from odml2.api.base import KIND_VALUE, KIND_SECTION
 from odml2.checks import *
 
 __all__ = ("Section", "Value", "NameSpace", "PropertyDef", "TypeDef", "Value.from_obj")
 
 PLUS_MINUS_UNICODE = u"±"
-PLUS_MINUS = PLUS_MINUS_UNICODE if six.PY3 else "+-"
-ALLOWED_VALUE_TYPES = (bool, numbers.Number, dt.date, dt.time, dt.datetime) + six.string_types
+PLUS_MINUS = PLUS_MINUS_UNICODE
+ALLOWED_VALUE_TYPES = (bool, numbers.Number, dt.date, dt.time, dt.datetime, str)
+# concrete types checked with a plain hash lookup before falling back to the
+# slower ABC based isinstance check against ALLOWED_VALUE_TYPES
+FAST_VALUE_TYPES = frozenset((bool, int, float, str, dt.date, dt.time, dt.datetime))
 VALUE_TYPE_MAP = {bool: "bool", int: "int", numbers.Number: "float", dt.datetime: "datetime",
-                  dt.time: "time", dt.date: "date", six.string_types: "string"}
-VALUE_EXPR = re.compile(u"^([-+]?(([0-9]+)|([0-9]*\.[0-9]+([eE][-+]?[0-9]+)?)))\s?" +
-                        u"((\+-|\\xb1)(([0-9]+)|([0-9]*\.[0-9]+([eE][-+]?[0-9]+)?)))?\s?" +
-                        u"([A-Za-zΩμ]{1,4})?$")
+                  dt.time: "time", dt.date: "date", str: "string"}
+# compiled once at import; a single pattern covers number, optional
+# "+-"/"±" uncertainty and optional unit in one pass over the string
+VALUE_EXPR = re.compile(r"(?P<num>[-+]?(?:[0-9]+|[0-9]*\.[0-9]+(?:[eE][-+]?[0-9]+)?))\s?"
+                        r"(?:(?:\+-|±)(?P<unc>[0-9]+|[0-9]*\.[0-9]+(?:[eE][-+]?[0-9]+)?))?\s?"
+                        r"(?P<unit>[A-Za-zΩμ]{1,4})?")
 
 
-@python_2_unicode_compatible
-class Section(collections.MutableMapping):
+class Section(collections.abc.MutableMapping):
     """
     *NOTICE*: Section initialization is usually done by the API
     """
 
+    __slots__ = ("_Section__is_link", "_Section__uuid", "_Section__document", "_Section__sec")
+
     def __init__(self, uuid, document, is_link=False):
         self.__is_link = is_link
         self.__uuid = uuid
         self.__document = document
+        self.__sec = None
+
+    @property
+    def _sec(self):
+        """
+        The back-end section handle, looked up once per wrapper instead of
+        once per property access.
+        """
+        sec = self.__sec
+        if sec is None:
+            sec = self.__document.back_end.sections[self.__uuid]
+            self.__sec = sec
+        return sec
+
+    def _sec_for_write(self):
+        """
+        Like :attr:`~.Section._sec`, but always re-resolves the handle so a
+        write through a wrapper held across a delete raises KeyError instead
+        of mutating a detached section. Mutations are rare, reads keep the
+        cached handle.
+        """
+        sec = self.__document.back_end.sections[self.__uuid]
+        self.__sec = sec
+        return sec
 
     @property
     def uuid(self):
@@ -59,14 +89,14 @@ class Section(collections.MutableMapping):
 
         :type:      str
         """
-        return self.document.back_end.sections[self.uuid].get_type()
+        return self._sec.get_type()
 
     # noinspection PyShadowingBuiltins
     @type.setter
     def type(self, type):
         # TODO handle type or remove
         assert_prefixed_name(type)
-        self.document.back_end.sections[self.uuid].set_type(type)
+        self._sec_for_write().set_type(type)
 
     @property
     def label(self):
@@ -76,13 +106,13 @@ class Section(collections.MutableMapping):
 
         :type:      str
         """
-        return self.document.back_end.sections[self.uuid].get_label()
+        return self._sec.get_label()
 
     @label.setter
     def label(self, label):
-        if label is not None and not isinstance(label, six.string_types):
+        if label is not None and not isinstance(label, str):
             raise ValueError("Label must be a string")
-        self.document.back_end.sections[self.uuid].set_label(label)
+        self._sec_for_write().set_label(label)
 
     @property
     def reference(self):
@@ -91,13 +121,13 @@ class Section(collections.MutableMapping):
 
         :type:      str
         """
-        return self.document.back_end.sections[self.uuid].get_reference()
+        return self._sec.get_reference()
 
     @reference.setter
     def reference(self, reference):
-        if reference is not None and not isinstance(reference, six.string_types):
+        if reference is not None and not isinstance(reference, str):
             raise ValueError("Reference must be a string")
-        self.document.back_end.sections[self.uuid].set_reference(reference)
+        self._sec_for_write().set_reference(reference)
 
     @property
     def is_link(self):
@@ -137,21 +167,22 @@ class Section(collections.MutableMapping):
         :return:        A list of sections or a value
         """
 
+        document = self.__document
+
         def mk_section(ref):
             if ref.namespace is None:
-                doc = self.document
+                doc = document
             else:
-                doc = self.document.namespaces[ref.namespace].get_document()
+                doc = document.namespaces[ref.namespace].get_document()
             return Section(ref.uuid, doc, ref.is_link)
 
-        sec = self.document.back_end.sections[self.uuid]
-        if key in sec.value_properties:
-            return sec.value_properties[key]
-        elif key in sec.section_properties:
-            refs = sec.section_properties[key]
-            return [mk_section(ref) for ref in refs]
-        else:
+        entry = self._sec.properties.get(key)
+        if entry is None:
             return default
+        kind, data = entry
+        if kind == KIND_VALUE:
+            return data
+        return [mk_section(ref) for ref in data]
 
     def __getitem__(self, key):
         """
@@ -201,23 +232,40 @@ class Section(collections.MutableMapping):
         """
         if key in self:
             del self[key]
-        if isinstance(element, list):
-            for sub in element:
-                if isinstance(sub, odml2.SB):
-                    sub.build(self.document, self.uuid, key)
-                elif isinstance(sub, odml2.Section):
-                    sub._copy_section(self.document, self.uuid, key)
-                else:
-                    ValueError("Section builder expected but was %s" % type(sub))
-        elif isinstance(element, odml2.SB):
-            element.build(self.document, self.uuid, key)
-        elif isinstance(element, Section):
-            element._copy_section(self.document, self.uuid, key)
-        else:
-            sec = self.document.back_end.sections[self.uuid]
-            val = Value.from_obj(element)
-            self.document.terminology_strategy.handle_triple(self.document, self.type, key, val.type)
-            sec.value_properties[key] = Value.from_obj(element)
+        handler = _setitem_handler(element.__class__)
+        if handler is None:
+            # subclasses are not in the dispatch table, check them explicitly
+            if isinstance(element, odml2.SB):
+                handler = Section._set_builder
+            elif isinstance(element, Section):
+                handler = Section._set_section
+            else:
+                handler = Section._set_value
+        handler(self, key, element)
+
+    def _set_builder(self, key, element):
+        element.build(self.document, self.uuid, key)
+
+    # noinspection PyProtectedMember
+    def _set_section(self, key, element):
+        element._copy_section(self.document, self.uuid, key)
+
+    def _set_section_list(self, key, element):
+        for sub in element:
+            if isinstance(sub, odml2.SB):
+                sub.build(self.document, self.uuid, key)
+            elif isinstance(sub, Section):
+                # noinspection PyProtectedMember
+                sub._copy_section(self.document, self.uuid, key)
+            else:
+                raise ValueError("Section builder expected but was %s" % type(sub))
+
+    def _set_value(self, key, element):
+        document = self.__document
+        sec = self._sec_for_write()
+        val = Value.from_obj(element)
+        document.terminology_strategy.handle_triple(document, sec.get_type(), key, val.type)
+        sec.value_properties[key] = val
 
     def __delitem__(self, key):
         """
@@ -227,16 +275,18 @@ class Section(collections.MutableMapping):
         :param key:     The name of the property to remove.
         :type key:      str
         """
-        sec = self.document.back_end.sections[self.uuid]
-        if key in sec.value_properties:
+        sec = self._sec_for_write()
+        entry = sec.properties.get(key)
+        if entry is None:
+            raise KeyError("The section has no property with the name '%s'" % key)
+        kind, data = entry
+        if kind == KIND_VALUE:
             del sec.value_properties[key]
-        elif key in sec.section_properties:
-            for ref in sec.section_properties[key]:
+        else:
+            for ref in data:
                 if not ref.is_link and ref.uuid in self.document.back_end.sections:
                     del self.document.back_end.sections[ref.uuid]
             del sec.section_properties[key]
-        else:
-            raise KeyError("The section has no property with the name '%s'" % key)
 
     def __len__(self):
         """
@@ -244,8 +294,7 @@ class Section(collections.MutableMapping):
 
         :rtype:         int
         """
-        sec = self.document.back_end.sections[self.uuid]
-        return len(sec.value_properties) + len(sec.section_properties)
+        return len(self._sec.properties)
 
     def __iter__(self):
         """
@@ -254,8 +303,12 @@ class Section(collections.MutableMapping):
 
         :return:        A generator over all property targets
         """
-        sec = self.document.back_end.sections[self.uuid]
-        return itertools.chain(iter(sec.value_properties), iter(sec.section_properties))
+        # value properties are presented before section properties, as with
+        # the former per kind maps
+        props = self._sec.properties
+        return itertools.chain(
+            (p for p, entry in props.items() if entry[0] == KIND_VALUE),
+            (p for p, entry in props.items() if entry[0] == KIND_SECTION))
 
     def items(self):
         """
@@ -282,10 +335,11 @@ class Section(collections.MutableMapping):
     #
 
     def __eq__(self, other):
-        if isinstance(other, Section):
-            return self.uuid == other.uuid
-        else:
+        if self is other:
+            return True
+        if other.__class__ is not Section and not isinstance(other, Section):
             return False
+        return self.__uuid == other.uuid
 
     def __ne__(self, other):
         return not (self == other)
@@ -300,38 +354,74 @@ class Section(collections.MutableMapping):
     # Internally used methods
     #
 
-    # noinspection PyShadowingBuiltins
-    def _create_subsection(self, prop, type, uuid, label, reference):
-        self.document.terminology_strategy.handle_triple(self.document, self.type, prop, type)
-        self.document.back_end.sections.add(type, uuid, label, reference, self.uuid, prop)
-        return Section(uuid, self.document)
-
-    # noinspection PyShadowingBuiltins
-    def _create_subsection_link(self, prop, type, uuid, prefix):
-        self.document.terminology_strategy.handle_triple(self.document, self.type, prop, type)
-        self.document.back_end.sections.add_link(uuid, prefix, self.uuid, prop)
-
-    # noinspection PyProtectedMember
     def _copy_section(self, document, parent_uuid=None, parent_prop=None):
+        strategy = document.terminology_strategy
+        records = []
+        value_props = []
+        links = []
+        copied = set()
+        worklist = deque()
+
+        def collect(src, p_uuid, p_prop, p_type):
+            # sections already present in the target document or scheduled
+            # for copying become links, everything else is copied
+            strategy.handle_triple(document, p_type, p_prop, src.type)
+            if src.uuid in copied:
+                links.append((src.uuid, None, p_uuid, p_prop))
+                return
+            existing, prefix = document.find_section_and_prefix(src.uuid, search_namespaces=True)
+            if existing is not None:
+                links.append((src.uuid, prefix, p_uuid, p_prop))
+                return
+            records.append((src.type, src.uuid, src.label, src.reference, p_uuid, p_prop))
+            copied.add(src.uuid)
+            worklist.append(src)
+
         if parent_uuid is None:
-            section = document.create_root(self.type, self.uuid, self.label, self.reference)
-            for p, thing in self.items():
-                section[p] = thing
+            document.create_root(self.type, self.uuid, self.label, self.reference)
+            copied.add(self.uuid)
+            worklist.append(self)
         else:
             if parent_prop is None:
                 raise ValueError("A property name is needed in order to append a sub section")
-
             parent = document.find_section(parent_uuid)
             if parent is None:
                 raise ValueError("Parent section with uuid '%s' does not exist" % parent_uuid)
+            collect(self, parent_uuid, parent_prop, parent.type)
+
+        # the source tree is traversed only once, all section records, value
+        # properties and links are pushed to the back-end afterwards
+        while worklist:
+            src = worklist.popleft()
+            for p, thing in src.items():
+                if isinstance(thing, list):
+                    for sub in thing:
+                        collect(sub, src.uuid, p, src.type)
+                else:
+                    strategy.handle_triple(document, src.type, p, thing.type)
+                    value_props.append((src.uuid, p, thing))
 
-            section, prefix = document.find_section_and_prefix(self.uuid, search_namespaces=True)
-            if section is not None:
-                parent._create_subsection_link(parent_prop, self.type, self.uuid, prefix)
-            else:
-                section = parent._create_subsection(parent_prop, self.type, self.uuid, self.label, self.reference)
-                for p, thing in self.items():
-                    section[p] = thing
+        sections = document.back_end.sections
+        sections.add_many(records)
+        for uuid, p, val in value_props:
+            sections[uuid].value_properties.set(p, val)
+        for uuid, prefix, p_uuid, p_prop in links:
+            sections.add_link(uuid, prefix, p_uuid, p_prop)
+
+
+# type to handler dispatch used by Section.__setitem__, filled on first use
+# because odml2.SB is not importable while this module loads
+_SETITEM_HANDLERS = {}
+
+
+def _setitem_handler(element_type):
+    if not _SETITEM_HANDLERS:
+        _SETITEM_HANDLERS.update({
+            list: Section._set_section_list,
+            odml2.SB: Section._set_builder,
+            Section: Section._set_section,
+        })
+    return _SETITEM_HANDLERS.get(element_type)
 
 
 class Value(object):
@@ -349,18 +439,23 @@ class Value(object):
     :type uncertainty:      float
     """
 
+    __slots__ = ("_Value__value", "_Value__unit", "_Value__uncertainty", "_Value__type",
+                 "_Value__str_cache", "_Value__hash_cache")
+
     def __init__(self, value, unit=None, uncertainty=None):
-        if not isinstance(value, ALLOWED_VALUE_TYPES):
+        if type(value) not in FAST_VALUE_TYPES and not isinstance(value, ALLOWED_VALUE_TYPES):
             raise ValueError("Value must be a one of the following types: %s" %
                              ", ".join(str(t) for t in ALLOWED_VALUE_TYPES))
         self.__value = value
-        if unit is not None and not isinstance(unit, six.string_types):
+        if unit is not None and not isinstance(unit, str):
             raise ValueError("Unit must be a string")
         if (unit is not None or uncertainty is not None) and not isinstance(value, numbers.Number):
             raise ValueError("Uncertainty and unit must be None if value is not a number")
         self.__unit = unit
         self.__uncertainty = float(uncertainty) if uncertainty is not None else None
         self.__type = None
+        self.__str_cache = None
+        self.__hash_cache = None
 
     @property
     def value(self):
@@ -415,61 +510,74 @@ class Value(object):
 
         :return:    A (modified) copy of the value.
         """
+        if value is None and unit is None and uncertainty is None:
+            # values are immutable, an unmodified copy can be shared
+            return self
         return Value(
-            value if value is not None else self.value,
-            unit if unit is not None else self.unit,
-            uncertainty if uncertainty is not None else self.uncertainty
+            value if value is not None else self.__value,
+            unit if unit is not None else self.__unit,
+            uncertainty if uncertainty is not None else self.__uncertainty
         )
 
     def __lt__(self, other):
         return self.value < other.value
 
     def __eq__(self, other):
-        if isinstance(other, Value):
-            return self.value == other.value and self.unit == other.unit and self.uncertainty == other.uncertainty
-        else:
+        if self is other:
+            return True
+        if other.__class__ is not Value and not isinstance(other, Value):
             return False
+        return (self.__value == other.__value and self.__unit == other.__unit and
+                self.__uncertainty == other.__uncertainty)
 
     def __ne__(self, other):
         return not self == other
 
+    def __hash__(self):
+        # values are immutable, so the hash can be computed once and reused
+        h = self.__hash_cache
+        if h is None:
+            h = hash((self.__value, self.__unit, self.__uncertainty))
+            self.__hash_cache = h
+        return h
+
     @property
     def __value_str(self):
         if isinstance(self.value, (dt.date, dt.time, dt.datetime)):
             return self.value.isoformat()
-        elif isinstance(self.value, six.string_types):
+        elif isinstance(self.value, str):
             return self.value
         else:
             return str(self.value)
 
     def __str__(self):
-        parts = [self.__value_str]
-        if self.uncertainty is not None:
-            parts.append(PLUS_MINUS)
-            parts.append(str(self.uncertainty))
-        if self.unit is not None:
-            parts.append(self.unit)
-        return str().join(parts)
-
-    def __unicode__(self):
-        parts = [self.__value_str]
-        if self.uncertainty is not None:
-            parts.append(PLUS_MINUS_UNICODE)
-            parts.append(str(self.uncertainty))
-        if self.unit is not None:
-            parts.append(self.unit)
-        return u"".join(parts)
+        # values are immutable, so the rendered string is computed only once
+        s = self.__str_cache
+        if s is None:
+            parts = [self.__value_str]
+            if self.uncertainty is not None:
+                parts.append(PLUS_MINUS)
+                parts.append(str(self.uncertainty))
+            if self.unit is not None:
+                parts.append(self.unit)
+            s = str().join(parts)
+            self.__str_cache = s
+        return s
 
     def __repr__(self):
         return "Value(value=%s, unit=%s, uncertainty=%s)" % (self.value, self.unit, self.uncertainty)
 
     @staticmethod
-    def from_obj(thing):
+    def from_obj(thing, _match=VALUE_EXPR.fullmatch, _str_types=str, _allowed=ALLOWED_VALUE_TYPES,
+                 _fast=FAST_VALUE_TYPES):
         """
         Creates a value from all sorts of types of objects.
 
         If the value is a sting like '10 +-0.001 mV' it will be parsed to an equivalent of ``Value(10, 'mV', 0.001)``
 
+        The underscore parameters are module level constants bound as defaults, since
+        this method is invoked for every value parsed during a document load.
+
         :param thing:   The object to create a value from.
 
         :return:        The created value object.
@@ -477,25 +585,57 @@ class Value(object):
 
         :raises:        ValueError if the object can't be converted to a value.
         """
-        if isinstance(thing, six.string_types):
-            match = VALUE_EXPR.match(thing)
+        if isinstance(thing, _str_types):
+            # the expression is anchored on a sign, digit or dot, so other strings
+            # can never match and the regex can be skipped for them entirely
+            if not thing or thing[0] not in "+-.0123456789":
+                return _plain_value(thing)
+            # literals like "5ms" recur across many properties, the parsed
+            # result is shared since values are immutable
+            val = _PARSED_VALUES.get(thing)
+            if val is not None:
+                return val
+            match = _match(thing)
             if match is None:
-                return Value(thing)
+                return _plain_value(thing)
             else:
-                g = match.groups()
-                num, is_float, uncertainty, unit = (g[0], g[3], g[7], g[11])
-                num = float(num) if is_float is not None else int(num)
+                num, uncertainty, unit = match.group("num", "unc", "unit")
+                # the expression only allows an exponent after a dot, so the
+                # dot alone decides between int and float
+                num = float(num) if "." in num else int(num)
                 uncertainty = float(uncertainty) if uncertainty is not None else None
-                return Value(num, unit, uncertainty)
-        if isinstance(thing, ALLOWED_VALUE_TYPES):
-            return Value(thing)
+                val = Value(num, unit, uncertainty)
+                if len(_PARSED_VALUES) < _VALUE_INTERN_MAX_SIZE:
+                    _PARSED_VALUES[thing] = val
+                return val
+        if type(thing) in _fast or isinstance(thing, _allowed):
+            return _plain_value(thing)
         elif isinstance(thing, Value):
             return thing
         else:
             raise ValueError("Can't covert '%s' to a value" % repr(thing))
 
 
-@python_2_unicode_compatible
+# intern table for values without unit and uncertainty, recurring scalars like
+# flags and enum-ish strings then share a single immutable Value instance
+_VALUE_INTERN = {}
+_VALUE_INTERN_MAX_SIZE = 4096
+
+# parse results of numeric string literals keyed by the input string, so
+# repeated literals skip the regex and value construction entirely
+_PARSED_VALUES = {}
+
+
+def _plain_value(value):
+    key = (value.__class__, value)
+    val = _VALUE_INTERN.get(key)
+    if val is None:
+        val = Value(value)
+        if len(_VALUE_INTERN) < _VALUE_INTERN_MAX_SIZE:
+            _VALUE_INTERN[key] = val
+    return val
+
+
 class NameSpace(object):
     """
     Create a new namespace object.
@@ -506,6 +646,8 @@ class NameSpace(object):
     :type uri:          str
     """
 
+    __slots__ = ("_NameSpace__prefix", "_NameSpace__uri", "_NameSpace__doc")
+
     def __init__(self, prefix, uri):
         assert_prefix(prefix)
         self.__prefix = prefix
@@ -583,8 +725,7 @@ class NameSpace(object):
         return str(self)
 
 
-@python_2_unicode_compatible
-class NameSpaceMap(collections.MutableMapping):
+class NameSpaceMap(collections.abc.MutableMapping):
 
     def __init__(self, back_end):
         self.__back_end = back_end
@@ -614,7 +755,6 @@ class NameSpaceMap(collections.MutableMapping):
         return str(self)
 
 
-@python_2_unicode_compatible
 class TypeDef(object):
     """
     Creates a new type definition.
@@ -626,6 +766,9 @@ class TypeDef(object):
     :param properties:  A set of property names.
     :type properties:   frozenset[str]
     """
+
+    __slots__ = ("_TypeDef__name", "_TypeDef__definition", "_TypeDef__properties")
+
     def __init__(self, name, definition=None, properties=frozenset()):
         assert_name(name)
         for p in properties:
@@ -668,8 +811,7 @@ class TypeDef(object):
         return str(self)
 
 
-@python_2_unicode_compatible
-class TypeDefMap(collections.MutableMapping):
+class TypeDefMap(collections.abc.MutableMapping):
 
     def __init__(self, back_end):
         self.__back_end = back_end
@@ -699,7 +841,6 @@ class TypeDefMap(collections.MutableMapping):
         return str(self)
 
 
-@python_2_unicode_compatible
 class PropertyDef(object):
     """
     Crates a new property definition.
@@ -713,6 +854,8 @@ class PropertyDef(object):
     :type types:        frozenset[str]
     """
 
+    __slots__ = ("_PropertyDef__name", "_PropertyDef__definition", "_PropertyDef__types")
+
     def __init__(self, name, definition=None, types=frozenset()):
         assert_name(name)
         for t in types:
@@ -755,8 +898,7 @@ class PropertyDef(object):
         return str(self)
 
 
-@python_2_unicode_compatible
-class PropertyDefMap(collections.MutableMapping):
+class PropertyDefMap(collections.abc.MutableMapping):
 
     def __init__(self, back_end):
         self.__back_end = back_end
@@ -8,7 +8,6 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
-from future.utils import python_2_unicode_compatible
 import enum
 
 import odml2
@@ -147,7 +146,6 @@ class StrictStrategy(BasicStrategy):
         _get_type_definition(document, prefix, type)
 
 
-@python_2_unicode_compatible
 class TerminologyStrategy(BasicStrategy, enum.Enum):
     Ignore = BasicStrategy()
     Create = CreateStrategy()
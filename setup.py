@@ -9,6 +9,15 @@
 import re
 from setuptools import setup, find_packages
 
+# odml2/model.py holds the per-property hot paths (Value parsing, Section
+# access). If Cython is available it is compiled as an extension in pure
+# Python mode; without Cython the plain module is used unchanged.
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(["odml2/model.py"])
+except ImportError:
+    ext_modules = []
+
 
 with open("README.md") as f:
     description_text = f.read()
@@ -40,16 +49,19 @@ setup(
 
     packages=find_packages(exclude=("test", )),
 
+    ext_modules=ext_modules,
+
     install_requires=[
-        "enum34",
         "setuptools",
-        "six",
-        "future",
         "sortedcontainers",
         "requests",
         "PyYAML"
     ],
 
+    extras_require={
+        "cache": ["msgpack"]
+    },
+
     tests_require=[
         "nose"
     ],
@@ -58,10 +70,7 @@ setup(
 
     classifiers=[
         "Programming Language :: Python",
-        "Programming Language :: Python :: 2.7",
-        "Programming Language :: Python :: 3.3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5"
+        "Programming Language :: Python :: 3"
     ],
 
     package_data={PACKAGE: [license_text, description_text]},
@@ -8,11 +8,14 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
+import os
+import tempfile
 import unittest
 from datetime import datetime
 from uuid import uuid4
 
 from odml2 import Value
+from odml2.api import yml
 from odml2.api.base import BaseSection
 from odml2.api.yml import YamlDocument
 
@@ -116,6 +119,23 @@ class TestYamlDocument(unittest.TestCase):
         # TODO test serialization
         pass
 
+    @unittest.skipIf(yml.msgpack is None, "msgpack is not installed")
+    def test_snapshot_restore(self):
+        id01 = str(uuid4())
+        self.doc.set_author("John Doe")
+        self.doc.create_root("Experiment", id01, "experiment one", None)
+        self.doc.sections[id01].value_properties.set("duration", Value(1.0, "ms", 0.001))
+
+        path = os.path.join(tempfile.mkdtemp(), "doc.snapshot")
+        self.doc.snapshot(path)
+
+        other = YamlDocument()
+        other.restore(path)
+        os.remove(path)
+        self.assertEqual(other.get_author(), "John Doe")
+        self.assertEqual(other.get_root(), id01)
+        self.assertEqual(other.sections[id01].value_properties["duration"], Value(1.0, "ms", 0.001))
+
 
 class TestYamlSection(unittest.TestCase):
 
@@ -94,6 +94,24 @@ class TestDocument(unittest.TestCase):
         self.assertEqual(yaml_str, f1.getvalue())
         f1.close()
 
+    def test_load_save_binary_stream(self):
+        self.doc.author = "John Doe"
+
+        f1 = io.BytesIO()
+        self.doc.save(f1)
+        yaml_bytes = f1.getvalue()
+        f1.close()
+        f1 = io.BytesIO(yaml_bytes)
+        doc = Document()
+        doc.load(f1)
+        f1.close()
+        self.assertEqual(doc.author, "John Doe")
+        self.assertEqual(doc.root.uuid, self.root_uuid)
+        f1 = io.BytesIO()
+        doc.save(f1)
+        self.assertEqual(yaml_bytes, f1.getvalue())
+        f1.close()
+
 
 class TestDocumentLinks(unittest.TestCase):
 
@@ -125,6 +143,8 @@ class TestDocumentLinks(unittest.TestCase):
 
     def tearDown(self):
         os.remove("parent.yml")
+        if os.path.exists("parent.yml.cache"):
+            os.remove("parent.yml.cache")
 
     def test_in_document_links(self):
         s1 = self.doc.root["stimuli"][0]
@@ -8,7 +8,6 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the project.
 
-import six
 import unittest
 from uuid import uuid4
 
@@ -183,13 +182,7 @@ class TestValue(unittest.TestCase):
 
     def test_str(self):
         v1 = Value(1, "mV", 0.1)
-
-        if six.PY2:
-            self.assertEqual(str(v1), "1+-0.1mV")
-            # noinspection PyUnresolvedReferences
-            self.assertEqual(unicode(v1), u"1±0.1mV")
-        else:
-            self.assertEqual(str(v1), "1±0.1mV")
+        self.assertEqual(str(v1), "1±0.1mV")
 
 
 class TestNameSpace(unittest.TestCase):
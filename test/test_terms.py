@@ -30,6 +30,8 @@ class TestStrictStrategy(unittest.TestCase):
 
     def tearDown(self):
         os.remove("terms.yml")
+        if os.path.exists("terms.yml.cache"):
+            os.remove("terms.yml.cache")
 
     def test_handle_type(self):
         ts = self.doc.terminology_strategy
@@ -75,6 +77,8 @@ class TestCreateStrategy(unittest.TestCase):
 
     def tearDown(self):
         os.remove("terms.yml")
+        if os.path.exists("terms.yml.cache"):
+            os.remove("terms.yml.cache")
 
     def test_handle_type(self):
         ts = self.doc.terminology_strategy